@@ -0,0 +1,58 @@
+"""In-process TTL caches for candle payloads and computed indicators"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+from .config import config
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a fixed time-to-live"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        # Indicator computation may run outside the event loop thread
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Return the cached value for key, or default if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entry when full"""
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# Raw candles keyed by (provider, symbol, interval, from, to)
+candle_cache = TTLCache(maxsize=config.CACHE_MAX_ENTRIES, ttl=config.CACHE_TTL_SECONDS)
+
+# Computed indicator arrays keyed by ((provider, symbol, interval, from, to), indicator_name)
+indicator_cache = TTLCache(maxsize=config.CACHE_MAX_ENTRIES, ttl=config.CACHE_TTL_SECONDS)
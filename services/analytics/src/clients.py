@@ -1,20 +1,42 @@
 """HTTP client for Market Data Service"""
 import httpx
-from typing import List
-from .models import OHLCVCandle, Interval
+import numpy as np
+import orjson
+from typing import Any, Dict, List, Optional
+from .models import CandleArrays, CANDLE_FLOAT_DTYPE, Interval
+from .cache import TTLCache, candle_cache
 
 
 class MarketDataClient:
     """Client for fetching candle data from Market Data Service"""
 
-    def __init__(self, base_url: str):
+    def __init__(
+        self,
+        base_url: str,
+        cache: Optional[TTLCache] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
         self.base_url = base_url
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # Keep warm connections to market-data so concurrent requests reuse them;
+        # HTTP/2 is negotiated when the upstream is served over TLS
+        self.client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            timeout=httpx.Timeout(30.0, connect=2.0),
+            transport=transport,
+        )
+        # Shared across client instances so indicator and signal requests reuse fetches
+        self.cache = cache if cache is not None else candle_cache
 
     async def get_candles(
         self, provider: str, symbol: str, interval: Interval, from_ts: int, to_ts: int
-    ) -> List[OHLCVCandle]:
-        """Fetch historical candles"""
+    ) -> CandleArrays:
+        """Fetch historical candles (served from cache when the same range was fetched recently)"""
+        cache_key = (provider, symbol, interval, from_ts, to_ts)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         params = {
             "provider": provider,
             "symbol": symbol,
@@ -27,9 +49,28 @@ class MarketDataClient:
         response = await self.client.get(url, params=params)
         response.raise_for_status()
 
-        data = response.json()
-        return [OHLCVCandle(**candle) for candle in data["candles"]]
+        data = orjson.loads(response.content)
+        candles = _to_candle_arrays(data["candles"])
+        # The same arrays are handed to every request for this range, so make them read-only
+        for column in (candles.timestamp, candles.open, candles.high, candles.low, candles.close, candles.volume):
+            column.flags.writeable = False
+        self.cache.set(cache_key, candles)
+        return candles
 
     async def close(self):
         """Close HTTP client"""
         await self.client.aclose()
+
+
+def _to_candle_arrays(items: List[Dict[str, Any]]) -> CandleArrays:
+    """Build column-wise candles straight from the decoded JSON, skipping per-candle models"""
+    n = len(items)
+    arrays = CandleArrays(
+        timestamp=np.fromiter((c["timestamp"] for c in items), dtype=np.int64, count=n),
+        open=np.fromiter((c["open"] for c in items), dtype=CANDLE_FLOAT_DTYPE, count=n),
+        high=np.fromiter((c["high"] for c in items), dtype=CANDLE_FLOAT_DTYPE, count=n),
+        low=np.fromiter((c["low"] for c in items), dtype=CANDLE_FLOAT_DTYPE, count=n),
+        close=np.fromiter((c["close"] for c in items), dtype=CANDLE_FLOAT_DTYPE, count=n),
+        volume=np.fromiter((c["volume"] for c in items), dtype=CANDLE_FLOAT_DTYPE, count=n),
+    )
+    return arrays.sorted_by_timestamp()
@@ -12,6 +12,10 @@ class Config:
     PORT: int = int(os.getenv("PORT", "4002"))
     MARKET_DATA_URL: str = os.getenv("MARKET_DATA_URL", "http://localhost:4001")
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    CACHE_TTL_SECONDS: float = float(os.getenv("CACHE_TTL_SECONDS", "60"))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "512"))
+    STREAM_IDLE_SECONDS: float = float(os.getenv("STREAM_IDLE_SECONDS", "86400"))
+    STREAM_MAX_SERIES: int = int(os.getenv("STREAM_MAX_SERIES", "4096"))
 
 
 config = Config()
@@ -0,0 +1,19 @@
+"""FastAPI dependencies shared by the API routers"""
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from fastapi import Request
+from .clients import MarketDataClient
+
+
+def get_market_data_client(request: Request) -> MarketDataClient:
+    """Return the Market Data Service client created in the app lifespan"""
+    return request.app.state.market_data_client
+
+
+def get_cpu_pool(request: Request) -> ThreadPoolExecutor:
+    """Return the CPU thread pool created in the app lifespan"""
+    return request.app.state.cpu_pool
+
+
+def get_process_pool(request: Request) -> ProcessPoolExecutor:
+    """Return the process pool created in the app lifespan"""
+    return request.app.state.process_pool
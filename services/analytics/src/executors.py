@@ -0,0 +1,19 @@
+"""Executors for CPU-bound work that must not block the event loop"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+def create_cpu_pool() -> ThreadPoolExecutor:
+    """Create the thread pool for indicator and signal computation"""
+    # Keeps the event loop responsive; only the nogil Numba kernels run in parallel across threads,
+    # TA-Lib calls and the row-building loops hold the GIL
+    return ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="analytics-cpu")
+
+
+def create_process_pool() -> ProcessPoolExecutor:
+    """Create the process pool for multi-symbol batches"""
+    # Workers are started on first use, when the app already runs threads; forking a
+    # multithreaded process can deadlock, so start them from a clean forkserver instead
+    return ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context("forkserver"))
+
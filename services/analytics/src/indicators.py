@@ -1,111 +1,207 @@
-"""Technical indicator calculations using pandas and ta library"""
-import pandas as pd
+"""Technical indicator calculations using NumPy and TA-Lib"""
+import hashlib
 import numpy as np
-from ta.trend import EMAIndicator
-from ta.momentum import RSIIndicator
-from ta.volatility import BollingerBands
-from ta.volume import VolumeWeightedAveragePrice
-from typing import List, Dict, Optional
-from .models import OHLCVCandle, IndicatorName
+import talib
+from numba import njit
+from typing import Any, Callable, List, Dict, Optional, Hashable, Sequence, Tuple, Union
+from .models import OHLCVCandle, CandleArrays, CANDLE_FLOAT_DTYPE, IndicatorName
+from .cache import indicator_cache
+
+
+def candles_to_arrays(candles: Sequence[OHLCVCandle]) -> CandleArrays:
+    """Convert list of candles to column-wise arrays sorted by timestamp"""
+    n = len(candles)
+    timestamp = np.empty(n, dtype=np.int64)
+    open_ = np.empty(n, dtype=CANDLE_FLOAT_DTYPE)
+    high = np.empty(n, dtype=CANDLE_FLOAT_DTYPE)
+    low = np.empty(n, dtype=CANDLE_FLOAT_DTYPE)
+    close = np.empty(n, dtype=CANDLE_FLOAT_DTYPE)
+    volume = np.empty(n, dtype=CANDLE_FLOAT_DTYPE)
+
+    for i, c in enumerate(candles):
+        timestamp[i] = c.timestamp
+        open_[i] = c.open
+        high[i] = c.high
+        low[i] = c.low
+        close[i] = c.close
+        volume[i] = c.volume
+
+    arrays = CandleArrays(timestamp=timestamp, open=open_, high=high, low=low, close=close, volume=volume)
+    return arrays.sorted_by_timestamp()
+
+
+def as_candle_arrays(candles: Union[Sequence[OHLCVCandle], CandleArrays]) -> CandleArrays:
+    """Accept either candle models or already column-wise candles"""
+    if isinstance(candles, CandleArrays):
+        return candles
+    return candles_to_arrays(candles)
+
+
+def calculate_ema(close: np.ndarray, period: int) -> np.ndarray:
+    """Calculate Exponential Moving Average"""
+    return talib.EMA(close, timeperiod=period)
+
+
+@njit(cache=True, nogil=True)
+def _ema_multi(close: np.ndarray, periods: np.ndarray) -> np.ndarray:
+    """Compute one EMA per period in a single pass over close (SMA-seeded like TA-Lib)"""
+    n = close.shape[0]
+    k = periods.shape[0]
+    out = np.full((k, n), np.nan)
+    alpha = np.empty(k)
+    state = np.zeros(k)
+    for j in range(k):
+        alpha[j] = 2.0 / (periods[j] + 1)
+
+    for i in range(n):
+        x = close[i]
+        for j in range(k):
+            p = periods[j]
+            if i < p - 1:
+                state[j] += x
+            elif i == p - 1:
+                state[j] = (state[j] + x) / p
+                out[j, i] = state[j]
+            else:
+                state[j] = (x - state[j]) * alpha[j] + state[j]
+                out[j, i] = state[j]
+
+    return out
+
+
+def compute_emas(close: np.ndarray, periods: Tuple[int, ...]) -> Dict[int, np.ndarray]:
+    """Calculate several Exponential Moving Averages with one pass over the close array"""
+    out = _ema_multi(close, np.asarray(periods, dtype=np.int64))
+    return {period: out[j] for j, period in enumerate(periods)}
+
+
+def calculate_rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Calculate Relative Strength Index"""
+    return talib.RSI(close, timeperiod=period)
 
 
-def candles_to_dataframe(candles: List[OHLCVCandle]) -> pd.DataFrame:
-    """Convert list of candles to pandas DataFrame"""
-    if not candles:
-        return pd.DataFrame()
-
-    data = {
-        "timestamp": [c.timestamp for c in candles],
-        "open": [c.open for c in candles],
-        "high": [c.high for c in candles],
-        "low": [c.low for c in candles],
-        "close": [c.close for c in candles],
-        "volume": [c.volume for c in candles],
+def calculate_bollinger_bands(close: np.ndarray, period: int = 20, std_dev: int = 2) -> Dict[str, np.ndarray]:
+    """Calculate Bollinger Bands (upper, middle and lower band in a single pass)"""
+    upper, middle, lower = talib.BBANDS(close, timeperiod=period, nbdevup=std_dev, nbdevdn=std_dev)
+    return {
+        "bb_upper": upper,
+        "bb_middle": middle,
+        "bb_lower": lower,
     }
 
-    df = pd.DataFrame(data)
-    df = df.sort_values("timestamp")
-    return df
 
+def calculate_volume_sma(volume: np.ndarray, period: int = 20) -> np.ndarray:
+    """Calculate Simple Moving Average of volume"""
+    return talib.SMA(volume, timeperiod=period)
 
-def calculate_ema(df: pd.DataFrame, period: int) -> pd.Series:
-    """Calculate Exponential Moving Average"""
-    ema = EMAIndicator(close=df["close"], window=period)
-    return ema.ema_indicator()
 
+def _column_values(values: np.ndarray) -> List[Optional[float]]:
+    """Convert an indicator column to Python floats with NaN mapped to None"""
+    arr = np.asarray(values, dtype=np.float64)
+    column = arr.astype(object)
+    column[np.isnan(arr)] = None
+    return column.tolist()
 
-def calculate_rsi(df: pd.DataFrame, period: int = 14) -> pd.Series:
-    """Calculate Relative Strength Index"""
-    rsi = RSIIndicator(close=df["close"], window=period)
-    return rsi.rsi()
 
+def _assign(rows: List[Dict[str, Optional[float]]], columns: Dict[str, np.ndarray]) -> None:
+    """Write an indicator's output columns into the per-timestamp value dicts in a single pass"""
+    for key, values in columns.items():
+        if len(values) != len(rows):
+            raise ValueError(f"Indicator column {key} has {len(values)} values for {len(rows)} candles")
 
-def calculate_bollinger_bands(df: pd.DataFrame, period: int = 20, std_dev: int = 2) -> Dict[str, pd.Series]:
-    """Calculate Bollinger Bands"""
-    bb = BollingerBands(close=df["close"], window=period, window_dev=std_dev)
-    return {
-        "bb_upper": bb.bollinger_hband(),
-        "bb_middle": bb.bollinger_mavg(),
-        "bb_lower": bb.bollinger_lband(),
-    }
+    if len(columns) == 1:
+        ((key, values),) = columns.items()
+        for row, val in zip(rows, _column_values(values)):
+            row[key] = val
+        return
 
+    # Multi-column indicators (e.g. Bollinger Bands): convert every column up front,
+    # then visit each row once
+    keys = tuple(columns)
+    for row, vals in zip(rows, zip(*(_column_values(values) for values in columns.values()))):
+        row.update(zip(keys, vals))
 
-def calculate_volume_sma(df: pd.DataFrame, period: int = 20) -> pd.Series:
-    """Calculate Simple Moving Average of volume"""
-    return df["volume"].rolling(window=period).mean()
+
+def _series_digest(arrays: CandleArrays) -> bytes:
+    """Fingerprint the candle columns indicators are computed from"""
+    digest = hashlib.blake2b(digest_size=16)
+    for column in (arrays.timestamp, arrays.close, arrays.volume):
+        digest.update(np.ascontiguousarray(column).tobytes())
+    return digest.digest()
+
+
+EMA_PERIODS: Dict[str, int] = {"ema_20": 20, "ema_50": 50, "ema_200": 200}
+
+
+# Indicator name -> function of (close, volume) returning its output columns by result key
+INDICATOR_HANDLERS: Dict[IndicatorName, Callable[[np.ndarray, np.ndarray], Dict[str, np.ndarray]]] = {
+    "ema_20": lambda close, volume: {"ema_20": calculate_ema(close, 20)},
+    "ema_50": lambda close, volume: {"ema_50": calculate_ema(close, 50)},
+    "ema_200": lambda close, volume: {"ema_200": calculate_ema(close, 200)},
+    "rsi_14": lambda close, volume: {"rsi_14": calculate_rsi(close, 14)},
+    "bollinger_bands": lambda close, volume: calculate_bollinger_bands(close),
+    "volume_sma": lambda close, volume: {"volume_sma": calculate_volume_sma(volume)},
+}
 
 
 def calculate_indicators(
-    candles: List[OHLCVCandle], indicator_names: List[IndicatorName]
-) -> List[Dict[str, Optional[float]]]:
+    candles: Union[Sequence[OHLCVCandle], CandleArrays],
+    indicator_names: List[IndicatorName],
+    cache_key: Optional[Hashable] = None,
+) -> List[Dict[str, Any]]:
     """
     Calculate requested technical indicators
 
-    Returns a list of dicts, one per candle timestamp, with indicator values
+    When cache_key identifies the candle range (provider, symbol, interval, from, to),
+    computed indicator arrays are memoized per (cache_key, candle digest, indicator_name),
+    so a refetched range with different candles never reuses stale columns.
+
+    Returns a list of {"timestamp": ..., "values": {...}} dicts, one per candle timestamp,
+    already in the API response shape
     """
     if not candles:
         return []
 
-    df = candles_to_dataframe(candles)
-    results = []
+    arrays = as_candle_arrays(candles)
+
+    # TA-Lib and the Numba kernels operate on contiguous float64 buffers (no copy for fetched candles)
+    close = np.ascontiguousarray(arrays.close, dtype=np.float64)
+    volume = np.ascontiguousarray(arrays.volume, dtype=np.float64)
 
     # Initialize result structure
-    for _, row in df.iterrows():
-        result = {"timestamp": int(row["timestamp"])}
-        results.append(result)
+    row_values: List[Dict[str, Optional[float]]] = [{} for _ in range(len(arrays))]
+    results = [{"timestamp": ts, "values": values} for ts, values in zip(arrays.timestamp.tolist(), row_values)]
+
+    columns_by_name: Dict[IndicatorName, Dict[str, np.ndarray]] = {}
+    if cache_key is not None:
+        cache_key = (cache_key, _series_digest(arrays))
+        for indicator_name in indicator_names:
+            cached = indicator_cache.get((cache_key, indicator_name))
+            if cached is not None:
+                columns_by_name[indicator_name] = cached
+
+    # Fuse multiple EMAs into a single pass over close
+    ema_names = [
+        name for name in dict.fromkeys(indicator_names) if name in EMA_PERIODS and name not in columns_by_name
+    ]
+    if len(ema_names) >= 2:
+        emas = compute_emas(close, tuple(EMA_PERIODS[name] for name in ema_names))
+        for name in ema_names:
+            columns_by_name[name] = {name: emas[EMA_PERIODS[name]]}
+            if cache_key is not None:
+                indicator_cache.set((cache_key, name), columns_by_name[name])
 
     # Calculate each requested indicator
     for indicator_name in indicator_names:
-        if indicator_name == "ema_20":
-            values = calculate_ema(df, 20)
-            for i, val in enumerate(values):
-                results[i]["ema_20"] = float(val) if not pd.isna(val) else None
-
-        elif indicator_name == "ema_50":
-            values = calculate_ema(df, 50)
-            for i, val in enumerate(values):
-                results[i]["ema_50"] = float(val) if not pd.isna(val) else None
-
-        elif indicator_name == "ema_200":
-            values = calculate_ema(df, 200)
-            for i, val in enumerate(values):
-                results[i]["ema_200"] = float(val) if not pd.isna(val) else None
-
-        elif indicator_name == "rsi_14":
-            values = calculate_rsi(df, 14)
-            for i, val in enumerate(values):
-                results[i]["rsi_14"] = float(val) if not pd.isna(val) else None
-
-        elif indicator_name == "bollinger_bands":
-            bb = calculate_bollinger_bands(df)
-            for i in range(len(df)):
-                results[i]["bb_upper"] = float(bb["bb_upper"].iloc[i]) if not pd.isna(bb["bb_upper"].iloc[i]) else None
-                results[i]["bb_middle"] = float(bb["bb_middle"].iloc[i]) if not pd.isna(bb["bb_middle"].iloc[i]) else None
-                results[i]["bb_lower"] = float(bb["bb_lower"].iloc[i]) if not pd.isna(bb["bb_lower"].iloc[i]) else None
-
-        elif indicator_name == "volume_sma":
-            values = calculate_volume_sma(df)
-            for i, val in enumerate(values):
-                results[i]["volume_sma"] = float(val) if not pd.isna(val) else None
+        columns = columns_by_name.get(indicator_name)
+        if columns is None:
+            handler = INDICATOR_HANDLERS.get(indicator_name)
+            if handler is None:
+                continue
+            columns = handler(close, volume)
+            if cache_key is not None:
+                indicator_cache.set((cache_key, indicator_name), columns)
+
+        _assign(row_values, columns)
 
     return results
@@ -1,11 +1,15 @@
 """Analytics Service - FastAPI application"""
 import time
 import uuid
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from .routers import indicators, signals
+from .clients import MarketDataClient
 from .models import HealthResponse
+from .responses import ORJSONResponse
 from .config import config
+from .executors import create_cpu_pool, create_process_pool
 import logging
 
 # Configure logging
@@ -15,11 +19,33 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared resources on startup and release them on shutdown"""
+    logger.info(f"Analytics Service starting on port {config.PORT}")
+    logger.info(f"Market Data URL: {config.MARKET_DATA_URL}")
+    # One client (and connection pool) shared by all routers
+    app.state.market_data_client = MarketDataClient(config.MARKET_DATA_URL)
+    # Executors live and die with the app so a restarted lifespan gets fresh ones
+    app.state.cpu_pool = create_cpu_pool()
+    app.state.process_pool = create_process_pool()
+
+    yield
+
+    logger.info("Analytics Service shutting down")
+    await app.state.market_data_client.close()
+    app.state.cpu_pool.shutdown(wait=False)
+    app.state.process_pool.shutdown(wait=False)
+
+
 # Create FastAPI app
 app = FastAPI(
     title="PyTrader Analytics Service",
     description="Technical indicators and trading signals",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 @app.middleware("http")
@@ -70,22 +96,6 @@ async def health_check():
     )
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Startup event handler"""
-    logger.info(f"Analytics Service starting on port {config.PORT}")
-    logger.info(f"Market Data URL: {config.MARKET_DATA_URL}")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Shutdown event handler"""
-    logger.info("Analytics Service shutting down")
-    # Close HTTP client
-    await indicators.market_data_client.close()
-    await signals.market_data_client.close()
-
-
 if __name__ == "__main__":
     import uvicorn
 
@@ -1,5 +1,7 @@
 """Pydantic models for analytics API"""
+from dataclasses import dataclass
 from typing import List, Dict, Any, Optional, Literal
+import numpy as np
 from pydantic import BaseModel, Field, ConfigDict
 
 
@@ -10,7 +12,9 @@ SignalAction = Literal["buy", "sell", "hold"]
 
 
 class OHLCVCandle(BaseModel):
-    """OHLCV candlestick data"""
+    """OHLCV candlestick data (immutable; bulk numeric work uses CandleArrays)"""
+    model_config = ConfigDict(frozen=True)
+
     symbol: str
     interval: Interval
     timestamp: int
@@ -21,6 +25,40 @@ class OHLCVCandle(BaseModel):
     volume: float
 
 
+# Storage dtype for OHLCV columns; double precision so prices and volumes round-trip exactly
+# and TA-Lib and the Numba kernels can read the columns without a conversion pass
+CANDLE_FLOAT_DTYPE = np.float64
+
+
+@dataclass(slots=True, eq=False)
+class CandleArrays:
+    """Candle series stored column-wise (int64 timestamps, CANDLE_FLOAT_DTYPE OHLCV)"""
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return self.timestamp.shape[0]
+
+    def sorted_by_timestamp(self) -> "CandleArrays":
+        """Return the series ordered by timestamp (self when it already is, the common case)"""
+        if np.all(self.timestamp[1:] >= self.timestamp[:-1]):
+            return self
+
+        order = np.argsort(self.timestamp, kind="stable")
+        return CandleArrays(
+            timestamp=self.timestamp[order],
+            open=self.open[order],
+            high=self.high[order],
+            low=self.low[order],
+            close=self.close[order],
+            volume=self.volume[order],
+        )
+
+
 class CalculateIndicatorsRequest(BaseModel):
     """Request to calculate technical indicators"""
     model_config = ConfigDict(populate_by_name=True)
@@ -33,6 +71,27 @@ class CalculateIndicatorsRequest(BaseModel):
     indicators: List[IndicatorName]
 
 
+class BatchCalculateIndicatorsRequest(BaseModel):
+    """Request to calculate technical indicators for several symbols"""
+    model_config = ConfigDict(populate_by_name=True)
+
+    provider: str
+    symbols: List[str] = Field(..., min_length=1)
+    interval: Interval
+    from_: int = Field(..., alias="from")
+    to: int
+    indicators: List[IndicatorName]
+
+
+class StreamIndicatorsRequest(BaseModel):
+    """Request to append closed candles to live indicator state"""
+    provider: str
+    symbol: str
+    interval: Interval
+    candles: List[OHLCVCandle]
+    indicators: List[IndicatorName]
+
+
 class IndicatorResult(BaseModel):
     """Single indicator result at a timestamp"""
     timestamp: int
@@ -44,6 +103,17 @@ class CalculateIndicatorsResponse(BaseModel):
     results: List[IndicatorResult]
 
 
+class SymbolIndicatorResults(BaseModel):
+    """Calculated indicators for one symbol of a batch"""
+    symbol: str
+    results: List[IndicatorResult]
+
+
+class BatchCalculateIndicatorsResponse(BaseModel):
+    """Response with calculated indicators per symbol"""
+    results: List[SymbolIndicatorResults]
+
+
 class GenerateSignalsRequest(BaseModel):
     """Request to generate trading signals"""
     model_config = ConfigDict(populate_by_name=True)
@@ -54,6 +124,7 @@ class GenerateSignalsRequest(BaseModel):
     from_: int = Field(..., alias="from")
     to: int
     strategy_id: str
+    include_metadata: bool = False
 
 
 class Signal(BaseModel):
@@ -1,18 +1,36 @@
 """Indicators API router"""
+import asyncio
 import logging
-from fastapi import APIRouter, HTTPException, Request
-from ..models import CalculateIndicatorsRequest, CalculateIndicatorsResponse, IndicatorResult
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from fastapi import APIRouter, Depends, HTTPException, Request
+from ..models import (
+    BatchCalculateIndicatorsRequest,
+    BatchCalculateIndicatorsResponse,
+    CalculateIndicatorsRequest,
+    CalculateIndicatorsResponse,
+    StreamIndicatorsRequest,
+)
+from ..responses import ORJSONResponse
 from ..clients import MarketDataClient
+from ..dependencies import get_cpu_pool, get_market_data_client, get_process_pool
 from ..indicators import calculate_indicators
-from ..config import config
+from ..streaming import update_indicators
 
 router = APIRouter()
-market_data_client = MarketDataClient(config.MARKET_DATA_URL)
 logger = logging.getLogger(__name__)
 
 
-@router.post("/internal/indicators", response_model=CalculateIndicatorsResponse)
-async def calculate_indicators_endpoint(payload: CalculateIndicatorsRequest, request: Request):
+@router.post(
+    "/internal/indicators",
+    response_class=ORJSONResponse,
+    responses={200: {"model": CalculateIndicatorsResponse}},
+)
+async def calculate_indicators_endpoint(
+    payload: CalculateIndicatorsRequest,
+    request: Request,
+    market_data_client: MarketDataClient = Depends(get_market_data_client),
+    cpu_pool: ThreadPoolExecutor = Depends(get_cpu_pool),
+):
     """Calculate technical indicators for the specified time range"""
     request_id = getattr(request.state, "request_id", None)
     try:
@@ -30,19 +48,109 @@ async def calculate_indicators_endpoint(payload: CalculateIndicatorsRequest, req
         )
 
         if not candles:
-            return CalculateIndicatorsResponse(results=[])
+            return ORJSONResponse({"results": []})
 
-        # Calculate indicators
-        indicator_data = calculate_indicators(candles, payload.indicators)
+        # Calculate indicators (memoized per candle range and indicator)
+        cache_key = (payload.provider, payload.symbol, payload.interval, payload.from_, payload.to)
+        loop = asyncio.get_running_loop()
+        indicator_data = await loop.run_in_executor(
+            cpu_pool, calculate_indicators, candles, payload.indicators, cache_key
+        )
+
+        # Results are already in response shape; serialized by orjson without re-validation
+        return ORJSONResponse({"results": indicator_data})
+
+    except Exception as e:
+        logger.exception(f"[{request_id}] calculate_indicators failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(
+    "/internal/indicators/batch",
+    response_class=ORJSONResponse,
+    responses={200: {"model": BatchCalculateIndicatorsResponse}},
+)
+async def batch_calculate_indicators_endpoint(
+    payload: BatchCalculateIndicatorsRequest,
+    request: Request,
+    market_data_client: MarketDataClient = Depends(get_market_data_client),
+    process_pool: ProcessPoolExecutor = Depends(get_process_pool),
+):
+    """Calculate technical indicators for several symbols over the same time range"""
+    request_id = getattr(request.state, "request_id", None)
+    try:
+        logger.info(
+            f"[{request_id}] batch_calculate_indicators provider={payload.provider} symbols={payload.symbols} "
+            f"interval={payload.interval} from={payload.from_} to={payload.to} indicators={payload.indicators}"
+        )
+        # Fetch candles for all symbols concurrently
+        candle_sets = await asyncio.gather(
+            *(
+                market_data_client.get_candles(
+                    provider=payload.provider,
+                    symbol=symbol,
+                    interval=payload.interval,
+                    from_ts=payload.from_,
+                    to_ts=payload.to,
+                )
+                for symbol in payload.symbols
+            )
+        )
+
+        # Compute each symbol in a worker process (CandleArrays pickle cheaply)
+        loop = asyncio.get_running_loop()
+
+        async def compute(candles):
+            if not candles:
+                return []
+            return await loop.run_in_executor(process_pool, calculate_indicators, candles, payload.indicators)
+
+        indicator_sets = await asyncio.gather(*(compute(candles) for candles in candle_sets))
 
-        # Convert to response format
         results = [
-            IndicatorResult(timestamp=item["timestamp"], values={k: v for k, v in item.items() if k != "timestamp"})
-            for item in indicator_data
+            {"symbol": symbol, "results": indicator_data}
+            for symbol, indicator_data in zip(payload.symbols, indicator_sets)
         ]
+        return ORJSONResponse({"results": results})
+
+    except Exception as e:
+        logger.exception(f"[{request_id}] batch_calculate_indicators failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 
-        return CalculateIndicatorsResponse(results=results)
+@router.post(
+    "/internal/indicators/stream",
+    response_class=ORJSONResponse,
+    responses={200: {"model": CalculateIndicatorsResponse}},
+)
+async def stream_indicators_endpoint(
+    payload: StreamIndicatorsRequest,
+    request: Request,
+    cpu_pool: ThreadPoolExecutor = Depends(get_cpu_pool),
+):
+    """Append new closed candles to live indicator state and return only the new points"""
+    request_id = getattr(request.state, "request_id", None)
+    try:
+        logger.info(
+            f"[{request_id}] stream_indicators provider={payload.provider} symbol={payload.symbol} "
+            f"interval={payload.interval} candles={len(payload.candles)} indicators={payload.indicators}"
+        )
+        loop = asyncio.get_running_loop()
+        indicator_data = await loop.run_in_executor(
+            cpu_pool,
+            update_indicators,
+            payload.provider,
+            payload.symbol,
+            payload.interval,
+            payload.candles,
+            payload.indicators,
+        )
+
+        return ORJSONResponse({"results": indicator_data})
 
+    except ValueError as e:
+        logger.warning(f"[{request_id}] stream_indicators bad request: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.exception(f"[{request_id}] calculate_indicators failed: {e}")
+        logger.exception(f"[{request_id}] stream_indicators failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
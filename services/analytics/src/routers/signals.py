@@ -1,18 +1,24 @@
 """Signals API router"""
+import asyncio
 import logging
-from fastapi import APIRouter, HTTPException, Request
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import APIRouter, Depends, HTTPException, Request
 from ..models import GenerateSignalsRequest, GenerateSignalsResponse
 from ..clients import MarketDataClient
+from ..dependencies import get_cpu_pool, get_market_data_client
 from ..signals import generate_signals
-from ..config import config
 
 router = APIRouter()
-market_data_client = MarketDataClient(config.MARKET_DATA_URL)
 logger = logging.getLogger(__name__)
 
 
-@router.post("/internal/signals", response_model=GenerateSignalsResponse)
-async def generate_signals_endpoint(payload: GenerateSignalsRequest, request: Request):
+@router.post("/internal/signals", response_model=GenerateSignalsResponse, response_model_exclude_none=True)
+async def generate_signals_endpoint(
+    payload: GenerateSignalsRequest,
+    request: Request,
+    market_data_client: MarketDataClient = Depends(get_market_data_client),
+    cpu_pool: ThreadPoolExecutor = Depends(get_cpu_pool),
+):
     """Generate trading signals based on the specified strategy"""
     request_id = getattr(request.state, "request_id", None)
     try:
@@ -33,9 +39,12 @@ async def generate_signals_endpoint(payload: GenerateSignalsRequest, request: Re
             return GenerateSignalsResponse(signals=[])
 
         # Generate signals
-        signals = generate_signals(candles, payload.symbol, payload.strategy_id)
+        loop = asyncio.get_running_loop()
+        signals = await loop.run_in_executor(
+            cpu_pool, generate_signals, candles, payload.symbol, payload.strategy_id, payload.include_metadata
+        )
 
-        return GenerateSignalsResponse(signals=signals)
+        return GenerateSignalsResponse.model_construct(signals=signals)
 
     except ValueError as e:
         logger.warning(f"[{request_id}] generate_signals bad request: {e}")
@@ -1,12 +1,98 @@
 """Trading signal generation strategies"""
-import pandas as pd
-from typing import List
-from .models import OHLCVCandle, Signal, SignalAction
-from .indicators import candles_to_dataframe, calculate_ema, calculate_rsi
+import numpy as np
+from numba import njit
+from typing import List, Optional, Sequence, Tuple, Union
+from .models import OHLCVCandle, CandleArrays, Signal, SignalAction
+from .indicators import as_candle_arrays
+
+ACTION_HOLD = 0
+ACTION_BUY = 1
+ACTION_SELL = -1
+
+
+@njit(cache=True, nogil=True)
+def _ema_rsi_cross_nb(close: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute EMA(20), EMA(50), RSI(14) and the crossover action per bar in one pass
+
+    EMAs are SMA-seeded and RSI uses Wilder smoothing, matching TA-Lib. Warm-up
+    bars are NaN; comparisons against NaN are False, so they never signal.
+    Crossovers filtered out by RSI are holds (ACTION_HOLD).
+    """
+    n = close.shape[0]
+    ema_20 = np.full(n, np.nan)
+    ema_50 = np.full(n, np.nan)
+    rsi_14 = np.full(n, np.nan)
+    action = np.zeros(n, dtype=np.int8)
+
+    alpha_20 = 2.0 / 21.0
+    alpha_50 = 2.0 / 51.0
+    e20 = 0.0
+    e50 = 0.0
+    avg_gain = 0.0
+    avg_loss = 0.0
+    diff_prev = np.nan
+
+    for i in range(n):
+        x = close[i]
+
+        # EMAs: accumulate the SMA seed, then recurse
+        if i < 19:
+            e20 += x
+        elif i == 19:
+            e20 = (e20 + x) / 20.0
+            ema_20[i] = e20
+        else:
+            e20 = (x - e20) * alpha_20 + e20
+            ema_20[i] = e20
+
+        if i < 49:
+            e50 += x
+        elif i == 49:
+            e50 = (e50 + x) / 50.0
+            ema_50[i] = e50
+        else:
+            e50 = (x - e50) * alpha_50 + e50
+            ema_50[i] = e50
+
+        # RSI: average the first 14 changes, then Wilder smoothing
+        if i > 0:
+            change = x - close[i - 1]
+            gain = max(change, 0.0)
+            loss = max(-change, 0.0)
+            if i < 14:
+                avg_gain += gain
+                avg_loss += loss
+            else:
+                if i == 14:
+                    avg_gain = (avg_gain + gain) / 14.0
+                    avg_loss = (avg_loss + loss) / 14.0
+                else:
+                    avg_gain = (avg_gain * 13.0 + gain) / 14.0
+                    avg_loss = (avg_loss * 13.0 + loss) / 14.0
+                total = avg_gain + avg_loss
+                rsi_14[i] = 100.0 * (avg_gain / total) if total != 0.0 else 0.0
+
+        # Crossover with RSI filter
+        diff = ema_20[i] - ema_50[i]
+        rsi = rsi_14[i]
+        # Bullish crossover: EMA(20) crosses above EMA(50) with RSI(14) < 70
+        if diff_prev <= 0 and diff > 0 and rsi < 70:
+            action[i] = ACTION_BUY
+        # Bearish crossover: EMA(20) crosses below EMA(50) with RSI(14) > 30
+        elif diff_prev >= 0 and diff < 0 and rsi > 30:
+            action[i] = ACTION_SELL
+        diff_prev = diff
+
+    return ema_20, ema_50, rsi_14, action
 
 
 def generate_ema_crossover_rsi_signals(
-    candles: List[OHLCVCandle], symbol: str, strategy_id: str = "ema_crossover_rsi"
+    candles: Union[Sequence[OHLCVCandle], CandleArrays, np.ndarray],
+    symbol: str,
+    strategy_id: str = "ema_crossover_rsi",
+    include_metadata: bool = False,
+    timestamps: Optional[np.ndarray] = None,
 ) -> List[Signal]:
     """
     EMA Crossover + RSI Filter Strategy
@@ -15,86 +101,75 @@ def generate_ema_crossover_rsi_signals(
     Sell Signal: EMA(20) crosses below EMA(50) AND RSI(14) > 30
     Hold: All other conditions
 
-    Returns a list of signals with timestamps and confidence scores
+    candles may also be a plain array of close prices, with optional matching
+    timestamps (bar indices are used when omitted; a length mismatch raises ValueError).
+
+    Returns a list of signals with timestamps and confidence scores; the indicator
+    values behind each signal are attached as metadata when include_metadata is set
     """
     if len(candles) < 50:  # Need at least 50 candles for EMA(50)
         return []
 
-    df = candles_to_dataframe(candles)
-
-    # Calculate indicators
-    ema_20 = calculate_ema(df, 20)
-    ema_50 = calculate_ema(df, 50)
-    rsi_14 = calculate_rsi(df, 14)
-
-    # Add to dataframe
-    df["ema_20"] = ema_20
-    df["ema_50"] = ema_50
-    df["rsi_14"] = rsi_14
-
-    # Detect crossovers
-    df["ema_diff"] = df["ema_20"] - df["ema_50"]
-    df["ema_diff_prev"] = df["ema_diff"].shift(1)
-
-    signals = []
-
-    for i in range(1, len(df)):
-        row = df.iloc[i]
-        prev_row = df.iloc[i - 1]
-
-        # Skip if any indicator is NaN
-        if pd.isna(row["ema_20"]) or pd.isna(row["ema_50"]) or pd.isna(row["rsi_14"]):
-            continue
-
-        ema_diff = row["ema_diff"]
-        ema_diff_prev = row["ema_diff_prev"]
-        rsi = row["rsi_14"]
-
-        action: SignalAction = "hold"
-        confidence = 0.5  # Default confidence for hold
-
-        # Bullish crossover: EMA(20) crosses above EMA(50)
-        if ema_diff_prev <= 0 and ema_diff > 0:
-            if rsi < 70:
-                action = "buy"
-                # Confidence based on RSI (lower RSI = higher confidence for buy)
-                confidence = min(1.0, 0.5 + (70 - rsi) / 100)
-            else:
-                action = "hold"
-                confidence = 0.3  # Weak signal, RSI too high
-
-        # Bearish crossover: EMA(20) crosses below EMA(50)
-        elif ema_diff_prev >= 0 and ema_diff < 0:
-            if rsi > 30:
-                action = "sell"
-                # Confidence based on RSI (higher RSI = higher confidence for sell)
-                confidence = min(1.0, 0.5 + (rsi - 30) / 100)
-            else:
-                action = "hold"
-                confidence = 0.3  # Weak signal, RSI too low
-
-        # Only emit buy/sell signals, skip holds
-        if action != "hold":
-            signal = Signal(
+    if isinstance(candles, np.ndarray):
+        close = np.ascontiguousarray(candles, dtype=np.float64)
+        if timestamps is None:
+            timestamps = np.arange(close.shape[0], dtype=np.int64)
+        elif timestamps.shape[0] != close.shape[0]:
+            raise ValueError(f"Got {timestamps.shape[0]} timestamps for {close.shape[0]} close prices")
+    else:
+        arrays = as_candle_arrays(candles)
+        timestamps = arrays.timestamp
+        close = np.ascontiguousarray(arrays.close, dtype=np.float64)
+
+    # Calculate indicators and crossovers in a single compiled pass
+    ema_20, ema_50, rsi_14, actions = _ema_rsi_cross_nb(close)
+
+    signals: List[Signal] = []
+    append = signals.append
+    construct = Signal.model_construct
+
+    # Only bars with a buy/sell action become signals
+    for i in np.flatnonzero(actions).tolist():
+        rsi = float(rsi_14[i])
+        action: SignalAction
+        if actions[i] == ACTION_BUY:
+            action = "buy"
+            # Confidence based on RSI (lower RSI = higher confidence for buy)
+            confidence = min(1.0, 0.5 + (70 - rsi) / 100)
+        else:
+            action = "sell"
+            # Confidence based on RSI (higher RSI = higher confidence for sell)
+            confidence = min(1.0, 0.5 + (rsi - 30) / 100)
+
+        metadata = None
+        if include_metadata:
+            metadata = {
+                "ema_20": float(ema_20[i]),
+                "ema_50": float(ema_50[i]),
+                "rsi_14": rsi,
+            }
+
+        # Inputs were just computed here, so skip model validation
+        append(
+            construct(
                 symbol=symbol,
-                timestamp=int(row["timestamp"]),
+                timestamp=int(timestamps[i]),
                 action=action,
                 confidence=confidence,
-                price=float(row["close"]),
+                price=float(close[i]),
                 strategy_id=strategy_id,
-                metadata={
-                    "ema_20": float(row["ema_20"]),
-                    "ema_50": float(row["ema_50"]),
-                    "rsi_14": float(rsi),
-                },
+                metadata=metadata,
             )
-            signals.append(signal)
+        )
 
     return signals
 
 
 def generate_signals(
-    candles: List[OHLCVCandle], symbol: str, strategy_id: str
+    candles: Union[Sequence[OHLCVCandle], CandleArrays, np.ndarray],
+    symbol: str,
+    strategy_id: str,
+    include_metadata: bool = False,
 ) -> List[Signal]:
     """
     Generate trading signals based on the specified strategy
@@ -103,6 +178,6 @@ def generate_signals(
     - ema_crossover_rsi: EMA(20) vs EMA(50) crossover with RSI filter
     """
     if strategy_id == "ema_crossover_rsi":
-        return generate_ema_crossover_rsi_signals(candles, symbol, strategy_id)
+        return generate_ema_crossover_rsi_signals(candles, symbol, strategy_id, include_metadata)
     else:
         raise ValueError(f"Unknown strategy: {strategy_id}")
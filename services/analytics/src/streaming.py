@@ -0,0 +1,223 @@
+"""Incremental indicator state for live candle updates
+
+Each state object consumes one closed candle at a time in O(1) and produces the
+same values as the batch TA-Lib functions in indicators.py would for the full
+history, so appending K candles costs O(K) instead of recomputing from candle 0.
+"""
+import math
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+from .models import OHLCVCandle, IndicatorName, Interval
+from .cache import TTLCache
+from .config import config
+
+
+class EMAState:
+    """Exponential Moving Average seeded with the SMA of the first `period` closes"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.count = 0
+        self.seed_sum = 0.0
+        self.value: Optional[float] = None
+
+    def update(self, close: float) -> Optional[float]:
+        self.count += 1
+        if self.value is None:
+            self.seed_sum += close
+            if self.count == self.period:
+                self.value = self.seed_sum / self.period
+            return self.value
+
+        self.value += self.alpha * (close - self.value)
+        return self.value
+
+
+class RSIState:
+    """Relative Strength Index using Wilder smoothing of average gains and losses"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.count = 0
+        self.prev_close: Optional[float] = None
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.value: Optional[float] = None
+
+    def update(self, close: float) -> Optional[float]:
+        if self.prev_close is None:
+            self.prev_close = close
+            return None
+
+        change = close - self.prev_close
+        self.prev_close = close
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        self.count += 1
+
+        if self.count < self.period:
+            self.avg_gain += gain
+            self.avg_loss += loss
+            return None
+
+        if self.count == self.period:
+            self.avg_gain = (self.avg_gain + gain) / self.period
+            self.avg_loss = (self.avg_loss + loss) / self.period
+        else:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+
+        total = self.avg_gain + self.avg_loss
+        self.value = 100.0 * self.avg_gain / total if total != 0 else 0.0
+        return self.value
+
+
+class SMAState:
+    """Simple Moving Average over a sliding window"""
+
+    def __init__(self, period: int = 20):
+        self.period = period
+        self.window: Deque[float] = deque()
+        self.total = 0.0
+
+    def update(self, value: float) -> Optional[float]:
+        self.window.append(value)
+        self.total += value
+        if len(self.window) > self.period:
+            self.total -= self.window.popleft()
+        if len(self.window) < self.period:
+            return None
+        return self.total / self.period
+
+
+class BBState:
+    """Bollinger Bands over a sliding window using Welford's mean/variance updates"""
+
+    def __init__(self, period: int = 20, std_dev: float = 2.0):
+        self.period = period
+        self.std_dev = std_dev
+        self.window: Deque[float] = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, close: float) -> Tuple[Optional[float], Optional[float], Optional[float]]:
+        self.window.append(close)
+        if len(self.window) <= self.period:
+            # Growing window: standard Welford step
+            delta = close - self.mean
+            self.mean += delta / len(self.window)
+            self.m2 += delta * (close - self.mean)
+        else:
+            # Sliding window: replace the evicted value in one step
+            evicted = self.window.popleft()
+            old_mean = self.mean
+            self.mean += (close - evicted) / self.period
+            self.m2 += (close - evicted) * (close - self.mean + evicted - old_mean)
+
+        if len(self.window) < self.period:
+            return None, None, None
+
+        width = self.std_dev * math.sqrt(max(self.m2, 0.0) / self.period)
+        return self.mean + width, self.mean, self.mean - width
+
+
+# Indicator name -> factory for its streaming state
+STATE_FACTORIES: Dict[IndicatorName, Callable[[], Any]] = {
+    "ema_20": lambda: EMAState(20),
+    "ema_50": lambda: EMAState(50),
+    "ema_200": lambda: EMAState(200),
+    "rsi_14": lambda: RSIState(14),
+    "bollinger_bands": lambda: BBState(20, 2.0),
+    "volume_sma": lambda: SMAState(20),
+}
+
+
+class IndicatorStream:
+    """Streaming state for one indicator on one (provider, symbol, interval) series"""
+
+    def __init__(self, indicator_name: IndicatorName):
+        self.indicator_name = indicator_name
+        self.state = STATE_FACTORIES[indicator_name]()
+        self.last_timestamp: Optional[int] = None
+        self.lock = threading.Lock()
+
+    def update(self, candle: OHLCVCandle) -> Dict[str, Optional[float]]:
+        """Feed one closed candle and return the indicator values for it"""
+        if self.indicator_name == "bollinger_bands":
+            upper, middle, lower = self.state.update(candle.close)
+            values = {"bb_upper": upper, "bb_middle": middle, "bb_lower": lower}
+        elif self.indicator_name == "volume_sma":
+            values = {"volume_sma": self.state.update(candle.volume)}
+        else:
+            values = {self.indicator_name: self.state.update(candle.close)}
+
+        self.last_timestamp = candle.timestamp
+        return values
+
+
+# Live indicator state keyed by (provider, symbol, interval, indicator_name); series that
+# go idle or fall out of the LRU are dropped
+_streams = TTLCache(maxsize=config.STREAM_MAX_SERIES, ttl=config.STREAM_IDLE_SECONDS)
+_streams_lock = threading.Lock()
+
+
+def _get_stream(provider: str, symbol: str, interval: Interval, indicator_name: IndicatorName) -> IndicatorStream:
+    key = (provider, symbol, interval, indicator_name)
+    with _streams_lock:
+        stream = _streams.get(key)
+        if stream is None:
+            stream = IndicatorStream(indicator_name)
+        # Re-store on every use so the idle deadline moves forward
+        _streams.set(key, stream)
+        return stream
+
+
+def update_indicators(
+    provider: str,
+    symbol: str,
+    interval: Interval,
+    candles: Sequence[OHLCVCandle],
+    indicator_names: List[IndicatorName],
+) -> List[Dict[str, Any]]:
+    """
+    Append closed candles to the live indicator state and return the new points
+
+    Candles at or before the last timestamp already applied to an indicator are
+    ignored, so re-sending an overlapping window is safe. The first call for a
+    series (and the first after its state went idle) should include enough
+    history to warm the indicators up. Candles whose symbol or interval differ
+    from the series raise ValueError.
+
+    Returns a list of {"timestamp": ..., "values": {...}} dicts, one per new candle timestamp
+    """
+    for candle in candles:
+        if candle.symbol != symbol or candle.interval != interval:
+            raise ValueError(
+                f"Candle {candle.symbol} {candle.interval} at {candle.timestamp} "
+                f"does not belong to series {symbol} {interval}"
+            )
+
+    ordered = sorted(candles, key=lambda c: c.timestamp)
+    rows: Dict[int, Dict[str, Any]] = {}
+
+    for indicator_name in indicator_names:
+        # Unsupported names must not take up a slot in the stream registry
+        if indicator_name not in STATE_FACTORIES:
+            continue
+        stream = _get_stream(provider, symbol, interval, indicator_name)
+
+        with stream.lock:
+            for candle in ordered:
+                if stream.last_timestamp is not None and candle.timestamp <= stream.last_timestamp:
+                    continue
+                row = rows.setdefault(candle.timestamp, {"timestamp": candle.timestamp, "values": {}})
+                row["values"].update(stream.update(candle))
+
+    return [rows[ts] for ts in sorted(rows)]
+
+
+def reset_streams() -> None:
+    """Drop all live indicator state"""
+    _streams.clear()
@@ -0,0 +1,22 @@
+"""Shared pytest configuration"""
+import numpy as np
+import pytest
+from src.indicators import compute_emas
+from src.signals import _ema_rsi_cross_nb
+from src.streaming import reset_streams
+
+
+@pytest.fixture(scope="session", autouse=True)
+def warm_up_jit():
+    """Compile (or load) the Numba kernels once so JIT time doesn't land in the first test"""
+    close = np.linspace(100.0, 200.0, 60)
+    _ema_rsi_cross_nb(close)
+    compute_emas(close, (20, 50))
+
+
+@pytest.fixture(autouse=True)
+def clean_streams():
+    """Start and end every test with no live indicator state"""
+    reset_streams()
+    yield
+    reset_streams()
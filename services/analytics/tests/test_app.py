@@ -0,0 +1,138 @@
+"""Tests for the application lifespan and API endpoints"""
+import math
+import pytest
+from fastapi.testclient import TestClient
+from src.dependencies import get_market_data_client
+from src.indicators import calculate_indicators, candles_to_arrays
+from src.main import app
+from src.models import CalculateIndicatorsResponse, OHLCVCandle
+from src.streaming import reset_streams
+
+
+class FakeMarketDataClient:
+    """Serves a fixed candle series instead of calling the Market Data Service"""
+
+    def __init__(self, candles):
+        self.candles = candles
+
+    async def get_candles(self, provider, symbol, interval, from_ts, to_ts):
+        return candles_to_arrays(self.candles)
+
+
+@pytest.fixture
+def series_candles():
+    """Generate candles that warm up every indicator and then turn up into an EMA crossover"""
+    candles = []
+    for i in range(100):
+        price = 50000 + 20 * abs(i - 50) + 300 * math.sin(i / 1.7)
+        candles.append(
+            OHLCVCandle(
+                symbol="BTC/USDT",
+                interval="1m",
+                timestamp=1234567890000 + i * 60000,
+                open=price,
+                high=price + 10,
+                low=price - 10,
+                close=price + 5,
+                volume=100.0,
+            )
+        )
+    return candles
+
+
+@pytest.fixture
+def api_client(series_candles):
+    """Test client whose market-data dependency serves series_candles"""
+    app.dependency_overrides[get_market_data_client] = lambda: FakeMarketDataClient(series_candles)
+    try:
+        with TestClient(app) as client:
+            yield client
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_app_can_restart(series_candles):
+    """Test that executors created on startup are usable again after a shutdown and restart"""
+    candle = series_candles[0]
+    payload = {
+        "provider": "mock",
+        "symbol": "BTC/USDT",
+        "interval": "1m",
+        "candles": [candle.model_dump()],
+        "indicators": ["ema_20"],
+    }
+
+    batch_payload = {
+        "provider": "mock",
+        "symbols": ["BTC/USDT", "ETH/USDT"],
+        "interval": "1m",
+        "from": 1234567890000,
+        "to": 1234573830000,
+        "indicators": ["ema_20", "rsi_14", "bollinger_bands"],
+    }
+    expected = calculate_indicators(series_candles, batch_payload["indicators"])
+    assert expected[-1]["values"]["ema_20"] is not None
+    app.dependency_overrides[get_market_data_client] = lambda: FakeMarketDataClient(series_candles)
+
+    try:
+        for _ in range(2):
+            reset_streams()
+            with TestClient(app) as client:
+                response = client.post("/internal/indicators/stream", json=payload)
+                assert response.status_code == 200
+                assert response.json() == {"results": [{"timestamp": candle.timestamp, "values": {"ema_20": None}}]}
+
+                response = client.post("/internal/indicators/batch", json=batch_payload)
+                assert response.status_code == 200
+                assert response.json()["results"] == [
+                    {"symbol": symbol, "results": expected} for symbol in batch_payload["symbols"]
+                ]
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_indicators_endpoint_response_shape(api_client, series_candles):
+    """Test that /internal/indicators returns the CalculateIndicatorsResponse shape with null warm-up values"""
+    response = api_client.post(
+        "/internal/indicators",
+        json={
+            "provider": "mock",
+            "symbol": "BTC/USDT",
+            "interval": "1m",
+            "from": 1234567890000,
+            "to": 1234573830000,
+            "indicators": ["ema_20", "rsi_14"],
+        },
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert CalculateIndicatorsResponse.model_validate(body).model_dump() == body
+    assert b'"values":{"ema_20":null,"rsi_14":null}' in response.content
+    assert body["results"] == calculate_indicators(series_candles, ["ema_20", "rsi_14"])
+    assert isinstance(body["results"][-1]["values"]["ema_20"], float)
+
+
+@pytest.mark.parametrize("include_metadata", [None, False, True])
+def test_signals_endpoint_metadata_is_opt_in(api_client, include_metadata):
+    """Test that /internal/signals only sends metadata when include_metadata is true"""
+    payload = {
+        "provider": "mock",
+        "symbol": "BTC/USDT",
+        "interval": "1m",
+        "from": 1234567890000,
+        "to": 1234573830000,
+        "strategy_id": "ema_crossover_rsi",
+    }
+    if include_metadata is not None:
+        payload["include_metadata"] = include_metadata
+
+    response = api_client.post("/internal/signals", json=payload)
+
+    assert response.status_code == 200
+    signals = response.json()["signals"]
+    assert signals
+    if include_metadata:
+        assert all(set(s["metadata"]) == {"ema_20", "ema_50", "rsi_14"} for s in signals)
+    else:
+        assert all("metadata" not in s for s in signals)
@@ -0,0 +1,49 @@
+"""Tests for the in-process TTL cache"""
+from src import cache as cache_module
+from src.cache import TTLCache
+
+
+def test_get_returns_stored_value():
+    """Test that stored values are returned until they expire"""
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.set(("binance", "BTC/USDT"), [1, 2, 3])
+
+    assert cache.get(("binance", "BTC/USDT")) == [1, 2, 3]
+    assert cache.get(("binance", "ETH/USDT")) is None
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    """Test that entries are dropped once their TTL has elapsed"""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.set("key", "value")
+
+    now[0] += 59
+    assert cache.get("key") == "value"
+
+    now[0] += 2
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    """Test that the cache never grows beyond maxsize"""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_zero_ttl_disables_caching():
+    """Test that a TTL of zero turns the cache into a no-op"""
+    cache = TTLCache(maxsize=4, ttl=0)
+    cache.set("key", "value")
+
+    assert cache.get("key") is None
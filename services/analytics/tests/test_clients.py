@@ -0,0 +1,107 @@
+"""Tests for the Market Data Service client"""
+import asyncio
+import httpx
+import numpy as np
+import pytest
+from src.cache import TTLCache
+from src.clients import MarketDataClient
+
+
+def _candle(timestamp: int, close: float) -> dict:
+    return {
+        "symbol": "BTC/USDT",
+        "interval": "1m",
+        "timestamp": timestamp,
+        "open": close - 5,
+        "high": close + 10,
+        "low": close - 10,
+        "close": close,
+        "volume": 100.0,
+    }
+
+
+def _fetch(client: MarketDataClient, from_ts: int, to_ts: int):
+    async def run():
+        try:
+            return await client.get_candles("mock", "BTC/USDT", "1m", from_ts, to_ts)
+        finally:
+            await client.close()
+
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def upstream():
+    """Mock Market Data Service that records the requests it receives"""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"candles": [_candle(1234567890000, 50005.0)]})
+
+    return requests, httpx.MockTransport(handler)
+
+
+def test_same_range_is_fetched_once(upstream):
+    """Test that repeated fetches of one range share a single upstream call"""
+    requests, transport = upstream
+    cache = TTLCache(maxsize=8, ttl=60)
+
+    async def run():
+        client = MarketDataClient("http://market-data", cache=cache, transport=transport)
+        try:
+            first = await client.get_candles("mock", "BTC/USDT", "1m", 0, 1)
+            second = await client.get_candles("mock", "BTC/USDT", "1m", 0, 1)
+            assert second is first
+            assert len(requests) == 1
+
+            await client.get_candles("mock", "BTC/USDT", "1m", 0, 2)
+            assert len(requests) == 2
+        finally:
+            await client.close()
+
+    asyncio.run(run())
+
+
+def test_cached_candles_are_read_only(upstream):
+    """Test that one caller cannot modify the candles another caller is served"""
+    _, transport = upstream
+    client = MarketDataClient("http://market-data", cache=TTLCache(maxsize=8, ttl=60), transport=transport)
+    candles = _fetch(client, 0, 1)
+
+    with pytest.raises(ValueError):
+        candles.close[0] = 0.0
+
+
+def _serving(candles: list) -> httpx.MockTransport:
+    return httpx.MockTransport(lambda request: httpx.Response(200, json={"candles": candles}))
+
+
+def test_get_candles_decodes_and_sorts_columns():
+    """Test that out-of-order candles are decoded into timestamp-ordered columns"""
+    candles = [_candle(1234567950000, 50030.5), _candle(1234567890000, 50005.3), _candle(1234567920000, 49990.1)]
+    client = MarketDataClient("http://market-data", cache=TTLCache(maxsize=8, ttl=60), transport=_serving(candles))
+
+    arrays = _fetch(client, 0, 1)
+
+    assert len(arrays) == 3
+    assert arrays.timestamp.dtype == np.int64
+    for column in (arrays.open, arrays.high, arrays.low, arrays.close, arrays.volume):
+        assert column.dtype == np.float64
+    assert arrays.timestamp.tolist() == [1234567890000, 1234567920000, 1234567950000]
+    assert arrays.close.tolist() == [50005.3, 49990.1, 50030.5]
+    assert arrays.open.tolist() == [50000.3, 49985.1, 50025.5]
+    assert arrays.high.tolist() == [50015.3, 50000.1, 50040.5]
+    assert arrays.low.tolist() == [49995.3, 49980.1, 50020.5]
+    assert arrays.volume.tolist() == [100.0, 100.0, 100.0]
+
+
+def test_get_candles_with_no_candles():
+    """Test that an empty candle list decodes into empty columns"""
+    client = MarketDataClient("http://market-data", cache=TTLCache(maxsize=8, ttl=60), transport=_serving([]))
+
+    arrays = _fetch(client, 0, 1)
+
+    assert len(arrays) == 0
+    assert arrays.timestamp.dtype == np.int64
+    assert arrays.close.dtype == np.float64
@@ -1,6 +1,8 @@
 """Tests for technical indicators"""
+import numpy as np
 import pytest
-from src.indicators import calculate_indicators, candles_to_dataframe
+from pydantic import ValidationError
+from src.indicators import calculate_indicators, candles_to_arrays, calculate_ema, compute_emas
 from src.models import OHLCVCandle
 
 
@@ -29,17 +31,54 @@ def sample_candles():
     return candles
 
 
-def test_candles_to_dataframe(sample_candles):
-    """Test conversion of candles to DataFrame"""
-    df = candles_to_dataframe(sample_candles)
+def test_candles_are_immutable(sample_candles):
+    """Test that candles cannot be modified after construction"""
+    with pytest.raises(ValidationError):
+        sample_candles[0].close = 0.0
 
-    assert len(df) == 100
-    assert "timestamp" in df.columns
-    assert "open" in df.columns
-    assert "high" in df.columns
-    assert "low" in df.columns
-    assert "close" in df.columns
-    assert "volume" in df.columns
+
+def test_candles_to_arrays(sample_candles):
+    """Test conversion of candles to column-wise arrays"""
+    arrays = candles_to_arrays(sample_candles)
+
+    assert len(arrays) == 100
+    for field in ("timestamp", "open", "high", "low", "close", "volume"):
+        assert len(getattr(arrays, field)) == 100
+    assert arrays.timestamp.dtype == np.int64
+    assert arrays.close.dtype == np.float64
+
+
+def test_candles_to_arrays_keeps_full_precision():
+    """Test that prices and large volumes survive the column conversion unchanged"""
+    candle = OHLCVCandle(
+        symbol="BTC/USDT",
+        interval="1m",
+        timestamp=1234567890000,
+        open=50005.3,
+        high=50010.7,
+        low=49990.1,
+        close=50005.3,
+        volume=123456789.0,
+    )
+    arrays = candles_to_arrays([candle])
+
+    assert arrays.close.tolist() == [50005.3]
+    assert arrays.volume.tolist() == [123456789.0]
+
+
+def test_candles_to_arrays_sorts_by_timestamp(sample_candles):
+    """Test that out-of-order candles are sorted by timestamp"""
+    arrays = candles_to_arrays(list(reversed(sample_candles)))
+
+    assert np.all(np.diff(arrays.timestamp) > 0)
+    assert arrays.close[0] == sample_candles[0].close
+
+
+def test_calculate_with_candle_arrays(sample_candles):
+    """Test that column-wise candles give the same results as candle models"""
+    arrays = candles_to_arrays(sample_candles)
+
+    assert calculate_indicators(arrays, ["ema_20", "rsi_14"]) == calculate_indicators(sample_candles, ["ema_20", "rsi_14"])
 
 
 def test_calculate_ema_20(sample_candles):
@@ -47,13 +86,13 @@ def test_calculate_ema_20(sample_candles):
     results = calculate_indicators(sample_candles, ["ema_20"])
 
     assert len(results) == 100
-    assert "ema_20" in results[0]
+    assert "ema_20" in results[0]["values"]
 
     # EMA should start as None until we have enough data
-    assert results[0]["ema_20"] is None or isinstance(results[0]["ema_20"], float)
+    assert results[0]["values"]["ema_20"] is None or isinstance(results[0]["values"]["ema_20"], float)
 
     # Later values should be calculated
-    assert isinstance(results[50]["ema_20"], float)
+    assert isinstance(results[50]["values"]["ema_20"], float)
 
 
 def test_calculate_rsi_14(sample_candles):
@@ -61,11 +100,11 @@ def test_calculate_rsi_14(sample_candles):
     results = calculate_indicators(sample_candles, ["rsi_14"])
 
     assert len(results) == 100
-    assert "rsi_14" in results[0]
+    assert "rsi_14" in results[0]["values"]
 
     # RSI later values should be between 0 and 100
-    if results[50]["rsi_14"] is not None:
-        assert 0 <= results[50]["rsi_14"] <= 100
+    if results[50]["values"]["rsi_14"] is not None:
+        assert 0 <= results[50]["values"]["rsi_14"] <= 100
 
 
 def test_calculate_multiple_indicators(sample_candles):
@@ -73,9 +112,9 @@ def test_calculate_multiple_indicators(sample_candles):
     results = calculate_indicators(sample_candles, ["ema_20", "ema_50", "rsi_14"])
 
     assert len(results) == 100
-    assert "ema_20" in results[0]
-    assert "ema_50" in results[0]
-    assert "rsi_14" in results[0]
+    assert "ema_20" in results[0]["values"]
+    assert "ema_50" in results[0]["values"]
+    assert "rsi_14" in results[0]["values"]
 
 
 def test_calculate_with_empty_candles():
@@ -91,11 +130,41 @@ def test_calculate_bollinger_bands(sample_candles):
     assert len(results) == 100
 
     # Check if all three bands are present
-    if results[50]["bb_upper"] is not None:
-        assert "bb_upper" in results[50]
-        assert "bb_middle" in results[50]
-        assert "bb_lower" in results[50]
+    if results[50]["values"]["bb_upper"] is not None:
+        assert "bb_upper" in results[50]["values"]
+        assert "bb_middle" in results[50]["values"]
+        assert "bb_lower" in results[50]["values"]
 
         # Upper should be > middle > lower
-        assert results[50]["bb_upper"] > results[50]["bb_middle"]
-        assert results[50]["bb_middle"] > results[50]["bb_lower"]
+        assert results[50]["values"]["bb_upper"] > results[50]["values"]["bb_middle"]
+        assert results[50]["values"]["bb_middle"] > results[50]["values"]["bb_lower"]
+
+
+def test_calculate_with_cache_key_reuses_results(sample_candles):
+    """Test that memoized indicator results match a fresh calculation"""
+    cache_key = ("mock", "BTC/USDT", "1m", 0, 1)
+    first = calculate_indicators(sample_candles, ["ema_20", "bollinger_bands"], cache_key=cache_key)
+    second = calculate_indicators(sample_candles, ["ema_20", "bollinger_bands"], cache_key=cache_key)
+
+    assert first == second
+    assert first == calculate_indicators(sample_candles, ["ema_20", "bollinger_bands"])
+
+
+def test_cached_results_follow_refetched_candles(sample_candles):
+    """Test that a refetched range with different candles is not served stale indicator columns"""
+    cache_key = ("mock", "BTC/USDT", "1m", 0, 2)
+    calculate_indicators(sample_candles[:-1], ["rsi_14"], cache_key=cache_key)
+
+    results = calculate_indicators(sample_candles, ["rsi_14"], cache_key=cache_key)
+
+    assert results == calculate_indicators(sample_candles, ["rsi_14"])
+    assert results[-1]["values"]["rsi_14"] is not None
+
+
+def test_compute_emas_matches_single_ema(sample_candles):
+    """Test that the fused multi-EMA pass matches individual EMA calculations"""
+    close = np.array([c.close for c in sample_candles], dtype=np.float64)
+    emas = compute_emas(close, (20, 50, 200))
+
+    for period in (20, 50, 200):
+        np.testing.assert_allclose(emas[period], calculate_ema(close, period), equal_nan=True)
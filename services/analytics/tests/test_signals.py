@@ -1,45 +1,96 @@
 """Tests for signal generation"""
+import math
+from typing import List, Tuple
+import numpy as np
 import pytest
 from src.signals import generate_ema_crossover_rsi_signals, generate_signals
-from src.models import OHLCVCandle
+from src.indicators import candles_to_arrays
+from src.models import OHLCVCandle, CandleArrays, CANDLE_FLOAT_DTYPE, Signal
+
+
+def _trend_arrays(base_price: float, step: float, close_offset: float, n: int = 100, pivot: int = 50) -> CandleArrays:
+    """Build a noisy price series whose trend reverses at pivot and then moves by step per bar"""
+    i = np.arange(n)
+    price = (base_price + step * np.abs(i - pivot) + 300 * np.sin(i / 1.7)).astype(CANDLE_FLOAT_DTYPE)
+    arrays = CandleArrays(
+        timestamp=1234567890000 + i * 60000,
+        open=price,
+        high=price + 10,
+        low=price - 10,
+        close=price + close_offset,
+        volume=np.full(n, 100.0, dtype=CANDLE_FLOAT_DTYPE),
+    )
+
+    # Shared across the session, so make sure no test can modify the data
+    for column in (arrays.timestamp, arrays.open, arrays.high, arrays.low, arrays.close, arrays.volume):
+        column.flags.writeable = False
+    return arrays
+
+
+def _to_candles(arrays: CandleArrays) -> Tuple[OHLCVCandle, ...]:
+    """Materialize column-wise candles as candle models"""
+    return tuple(
+        OHLCVCandle(symbol="BTC/USDT", interval="1m", timestamp=ts, open=o, high=h, low=l, close=c, volume=v)
+        for ts, o, h, l, c, v in zip(
+            arrays.timestamp.tolist(),
+            arrays.open.tolist(),
+            arrays.high.tolist(),
+            arrays.low.tolist(),
+            arrays.close.tolist(),
+            arrays.volume.tolist(),
+        )
+    )
 
 
-@pytest.fixture
-def trending_up_candles():
-    """Generate candles with upward trend (should trigger buy signals)"""
-    candles = []
-    base_price = 50000
-    timestamp = 1234567890000
+@pytest.fixture(scope="session")
+def trending_up_arrays():
+    """Generate column-wise candles turning into an upward trend (should trigger buy signals)"""
+    return _trend_arrays(base_price=50000, step=20, close_offset=5)
 
-    for i in range(100):
-        # Gradual upward trend
-        price = base_price + (i * 50)
-        candles.append(
-            OHLCVCandle(
-                symbol="BTC/USDT",
-                interval="1m",
-                timestamp=timestamp + (i * 60000),
-                open=price,
-                high=price + 10,
-                low=price - 10,
-                close=price + 5,
-                volume=100.0,
-            )
-        )
 
-    return candles
+@pytest.fixture(scope="session")
+def trending_up_candles(trending_up_arrays):
+    """Generate candles turning into an upward trend (should trigger buy signals)"""
+    return _to_candles(trending_up_arrays)
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def trending_down_candles():
-    """Generate candles with downward trend (should trigger sell signals)"""
+    """Generate candles turning into a downward trend (should trigger sell signals)"""
+    return _to_candles(_trend_arrays(base_price=55000, step=-20, close_offset=-5))
+
+
+def _as_arrays(signals: List[Signal]) -> Tuple[np.ndarray, List[str]]:
+    """Collect signal confidences into an array and actions into a list for bulk assertions"""
+    return np.fromiter((s.confidence for s in signals), np.float64, len(signals)), [s.action for s in signals]
+
+
+@pytest.fixture(scope="session")
+def up_signals(trending_up_candles):
+    """Signals for the upward trend, computed once and shared by the read-only tests"""
+    return generate_ema_crossover_rsi_signals(trending_up_candles, "BTC/USDT", include_metadata=True)
+
+
+@pytest.fixture(scope="session")
+def down_signals(trending_down_candles):
+    """Signals for the downward trend, computed once and shared by the read-only tests"""
+    return generate_ema_crossover_rsi_signals(trending_down_candles, "BTC/USDT", include_metadata=True)
+
+
+@pytest.fixture
+def signals_fx(request):
+    """Resolve the session signal fixture named by the test parameter"""
+    return request.getfixturevalue(request.param)
+
+
+@pytest.fixture
+def oscillating_candles():
+    """Generate candles whose EMAs cross several times (should trigger buy and sell signals)"""
     candles = []
-    base_price = 55000
     timestamp = 1234567890000
 
-    for i in range(100):
-        # Gradual downward trend
-        price = base_price - (i * 50)
+    for i in range(300):
+        price = 50000 + 1000 * math.sin(i / 30) + 300 * math.sin(i / 2.3)
         candles.append(
             OHLCVCandle(
                 symbol="BTC/USDT",
@@ -48,7 +99,7 @@ def trending_down_candles():
                 open=price,
                 high=price + 10,
                 low=price - 10,
-                close=price - 5,
+                close=price,
                 volume=100.0,
             )
         )
@@ -56,52 +107,62 @@ def trending_down_candles():
     return candles
 
 
-def test_generate_signals_with_uptrend(trending_up_candles):
-    """Test signal generation with upward trending candles"""
-    signals = generate_ema_crossover_rsi_signals(trending_up_candles, "BTC/USDT")
+@pytest.mark.parametrize("signals_fx", ["up_signals", "down_signals"], indirect=True)
+def test_generate_signals_with_trend(signals_fx):
+    """Test signal generation with upward and downward trending candles"""
+    signals = signals_fx
 
     # Should generate at least one signal
-    assert len(signals) >= 0
+    assert signals
 
     # All signals should have required fields
-    for signal in signals:
-        assert signal.symbol == "BTC/USDT"
-        assert signal.action in ["buy", "sell", "hold"]
-        assert 0.0 <= signal.confidence <= 1.0
-        assert signal.strategy_id == "ema_crossover_rsi"
-        assert signal.metadata is not None
+    _, actions = _as_arrays(signals)
+    timestamps = np.fromiter((s.timestamp for s in signals), np.int64, len(signals))
+    assert {s.symbol for s in signals} <= {"BTC/USDT"}
+    assert {s.strategy_id for s in signals} <= {"ema_crossover_rsi"}
+    assert set(actions) <= {"buy", "sell", "hold"}
+    assert (timestamps > 0).all()
+    assert next((s for s in signals if s.metadata is None), None) is None
+
 
+@pytest.mark.parametrize(
+    "signals_fx, expected_action", [("up_signals", "buy"), ("down_signals", "sell")], indirect=["signals_fx"]
+)
+def test_trend_signals_follow_trend(signals_fx, expected_action):
+    """Test that a trend turning up emits a buy and a trend turning down emits a sell"""
+    confidences, actions = _as_arrays(signals_fx)
 
-def test_generate_signals_with_downtrend(trending_down_candles):
-    """Test signal generation with downward trending candles"""
-    signals = generate_ema_crossover_rsi_signals(trending_down_candles, "BTC/USDT")
+    assert expected_action in actions
+    assert (confidences > 0.5).all(), f"Expected confident signals, got {confidences}"
 
-    # Should generate signals
-    assert len(signals) >= 0
 
-    # Check signal structure
-    for signal in signals:
-        assert signal.symbol == "BTC/USDT"
-        assert signal.timestamp > 0
+def test_generate_signals_from_arrays(oscillating_candles):
+    """Test that column-wise candles and raw close arrays produce the same signals as candle models"""
+    arrays = candles_to_arrays(oscillating_candles)
+    from_candles = generate_ema_crossover_rsi_signals(oscillating_candles, "BTC/USDT")
+    from_arrays = generate_ema_crossover_rsi_signals(arrays, "BTC/USDT")
+    from_closes = generate_ema_crossover_rsi_signals(arrays.close, "BTC/USDT", timestamps=arrays.timestamp)
+
+    assert len(from_candles) > 0
+    closes = {c.timestamp: c.close for c in oscillating_candles}
+    assert all(s.price == closes[s.timestamp] for s in from_candles)
+    assert from_arrays == from_candles
+    assert from_closes == from_candles
+
+
+@pytest.mark.parametrize("n_timestamps", [59, 61])
+def test_generate_signals_rejects_mismatched_timestamps(n_timestamps):
+    """Test that timestamps must match the close array one-to-one"""
+    close = 50005 + np.arange(60, dtype=np.float64) * 10
+    timestamps = np.arange(n_timestamps, dtype=np.int64)
+
+    with pytest.raises(ValueError, match="timestamps"):
+        generate_ema_crossover_rsi_signals(close, "BTC/USDT", timestamps=timestamps)
 
 
 def test_generate_signals_insufficient_data():
     """Test with insufficient candles (less than 50)"""
-    candles = [
-        OHLCVCandle(
-            symbol="BTC/USDT",
-            interval="1m",
-            timestamp=1234567890000 + (i * 60000),
-            open=50000 + i,
-            high=50010 + i,
-            low=49990 + i,
-            close=50005 + i,
-            volume=100.0,
-        )
-        for i in range(30)
-    ]
-
-    signals = generate_ema_crossover_rsi_signals(candles, "BTC/USDT")
+    signals = generate_ema_crossover_rsi_signals(np.arange(30, dtype=np.float64), "BTC/USDT")
 
     # Should return empty list due to insufficient data
     assert signals == []
@@ -109,19 +170,7 @@ def test_generate_signals_insufficient_data():
 
 def test_generate_signals_dispatcher():
     """Test the signal generation dispatcher"""
-    candles = [
-        OHLCVCandle(
-            symbol="BTC/USDT",
-            interval="1m",
-            timestamp=1234567890000 + (i * 60000),
-            open=50000 + (i * 10),
-            high=50010 + (i * 10),
-            low=49990 + (i * 10),
-            close=50005 + (i * 10),
-            volume=100.0,
-        )
-        for i in range(60)
-    ]
+    candles = 50005 + np.arange(60, dtype=np.float64) * 10
 
     # Test valid strategy
     signals = generate_signals(candles, "BTC/USDT", "ema_crossover_rsi")
@@ -132,20 +181,31 @@ def test_generate_signals_dispatcher():
         generate_signals(candles, "BTC/USDT", "unknown_strategy")
 
 
-def test_signal_confidence_values(trending_up_candles):
+@pytest.mark.parametrize("signals_fx", ["up_signals", "down_signals"], indirect=True)
+def test_signal_confidence_values(signals_fx):
     """Test that confidence values are within valid range"""
-    signals = generate_ema_crossover_rsi_signals(trending_up_candles, "BTC/USDT")
+    signals = signals_fx
 
-    for signal in signals:
-        assert 0.0 <= signal.confidence <= 1.0, f"Confidence out of range: {signal.confidence}"
+    confidences, _ = _as_arrays(signals)
+    out_of_range = confidences[(confidences < 0.0) | (confidences > 1.0)]
+    assert out_of_range.size == 0, f"Confidence out of range: {out_of_range}"
 
 
-def test_signal_metadata_structure(trending_up_candles):
+@pytest.mark.parametrize("signals_fx", ["up_signals", "down_signals"], indirect=True)
+def test_signal_metadata_structure(signals_fx):
     """Test that signal metadata contains expected fields"""
-    signals = generate_ema_crossover_rsi_signals(trending_up_candles, "BTC/USDT")
+    signals = signals_fx
+
+    expected = {"ema_20", "ema_50", "rsi_14"}
+    assert next((s for s in signals if s.metadata and not expected <= s.metadata.keys()), None) is None
+
+
+def test_signal_metadata_is_optional(oscillating_candles):
+    """Test that metadata is only built when requested"""
+    without_metadata = generate_ema_crossover_rsi_signals(oscillating_candles, "BTC/USDT")
+    with_metadata = generate_ema_crossover_rsi_signals(oscillating_candles, "BTC/USDT", include_metadata=True)
 
-    for signal in signals:
-        if signal.metadata:
-            assert "ema_20" in signal.metadata
-            assert "ema_50" in signal.metadata
-            assert "rsi_14" in signal.metadata
+    assert {s.action for s in with_metadata} == {"buy", "sell"}
+    assert [s.timestamp for s in without_metadata] == [s.timestamp for s in with_metadata]
+    assert all(s.metadata is None for s in without_metadata)
+    assert all(set(s.metadata) == {"ema_20", "ema_50", "rsi_14"} for s in with_metadata)
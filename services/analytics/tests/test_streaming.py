@@ -0,0 +1,102 @@
+"""Tests for incremental indicator state"""
+import numpy as np
+import pytest
+from src import cache as cache_module
+from src.config import config
+from src.indicators import calculate_indicators
+from src.models import OHLCVCandle
+from src import streaming
+from src.streaming import update_indicators
+
+
+@pytest.fixture
+def wavy_candles():
+    """Generate deterministic candles that move up and down"""
+    candles = []
+    timestamp = 1234567890000
+
+    for i in range(300):
+        price = 50000 + 500 * np.sin(i / 7) + i * 3
+        candles.append(
+            OHLCVCandle(
+                symbol="BTC/USDT",
+                interval="1m",
+                timestamp=timestamp + (i * 60000),
+                open=price,
+                high=price + 10,
+                low=price - 10,
+                close=price + 5,
+                volume=100.0 + (i % 13),
+            )
+        )
+
+    return candles
+
+
+INDICATORS = ["ema_20", "ema_50", "ema_200", "rsi_14", "bollinger_bands", "volume_sma"]
+
+
+def test_streaming_matches_batch(wavy_candles):
+    """Test that feeding candles in chunks matches the batch calculation"""
+    expected = calculate_indicators(wavy_candles, INDICATORS)
+
+    streamed = []
+    for start in range(0, len(wavy_candles), 37):
+        chunk = wavy_candles[start:start + 37]
+        streamed.extend(update_indicators("mock", "BTC/USDT", "1m", chunk, INDICATORS))
+
+    assert len(streamed) == len(expected)
+    for got, want in zip(streamed, expected):
+        assert got["timestamp"] == want["timestamp"]
+        for key, value in want["values"].items():
+            if value is None:
+                assert got["values"][key] is None
+            else:
+                assert got["values"][key] == pytest.approx(value, rel=1e-9)
+
+
+def test_streaming_ignores_already_applied_candles(wavy_candles):
+    """Test that re-sending overlapping candles only returns new points"""
+    update_indicators("mock", "BTC/USDT", "1m", wavy_candles[:100], ["ema_20"])
+
+    results = update_indicators("mock", "BTC/USDT", "1m", wavy_candles[90:110], ["ema_20"])
+
+    assert [r["timestamp"] for r in results] == [c.timestamp for c in wavy_candles[100:110]]
+
+
+def test_streaming_state_is_per_series(wavy_candles):
+    """Test that different symbols keep independent state"""
+    update_indicators("mock", "BTC/USDT", "1m", wavy_candles, ["ema_20"])
+
+    eth_candles = [c.model_copy(update={"symbol": "ETH/USDT"}) for c in wavy_candles[:5]]
+    results = update_indicators("mock", "ETH/USDT", "1m", eth_candles, ["ema_20"])
+
+    assert len(results) == 5
+    assert all(r["values"]["ema_20"] is None for r in results)
+
+
+def test_streaming_rejects_candles_from_another_series(wavy_candles):
+    """Test that candles for a different symbol are not applied to the keyed series"""
+    with pytest.raises(ValueError, match="does not belong"):
+        update_indicators("mock", "ETH/USDT", "1m", wavy_candles[:5], ["ema_20"])
+
+
+def test_idle_streams_are_evicted(wavy_candles, monkeypatch):
+    """Test that series state is dropped once it has been idle for the configured time"""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    update_indicators("mock", "BTC/USDT", "1m", wavy_candles[:30], ["ema_20"])
+
+    now[0] += config.STREAM_IDLE_SECONDS + 1
+    results = update_indicators("mock", "BTC/USDT", "1m", wavy_candles[:30], ["ema_20"])
+
+    # State started over, so the already-applied candles are computed again
+    assert len(results) == 30
+
+
+def test_unsupported_indicators_do_not_take_stream_slots(wavy_candles):
+    """Test that indicators without streaming state are skipped before the registry"""
+    results = update_indicators("mock", "BTC/USDT", "1m", wavy_candles[:5], ["macd"])
+
+    assert results == []
+    assert len(streaming._streams) == 0